@@ -1,20 +1,12 @@
 #!/usr/bin/env python3
-from sys import argv
+from sys import argv, stdout, stderr, exit
+from types import SimpleNamespace
 from os import path, makedirs
-import argparse
-import json
 
-from modules.classes import Language, IDE
-from modules.functions import get_language, get_languages, get_ides, get_templates, get_defaults, update_defaults, generate_defaults, generate_json
-from modules.create_project import create_project
-from modules.create_template import create_template, create_defaults
+from modules.classes import LanguageNotSupportedError
 
 
-def show_help():
-    """
-    Displays the help message.
-    """
-    print("""usage: codeforge.py [options] <project_name> <language> [args]
+HELP_TEXT = """usage: codeforge.py [options] <project_name> <language> [args]
 
 options:
     -h, --help      Show this help message and exit
@@ -52,197 +44,352 @@ examples:
     codeforge.py create "my project" c# -p -n -t "my template"
     codeforge.py template "my template" python "A custom description"
     codeforge.py default pyhon ide "vscode"
-""")
 
+"""
 
-def handle_args() -> None:
+
+# Maps each top-level flag to the name of its handler in HANDLERS
+FLAG_NAMES = {
+    "-h": "help", "--help": "help",
+    "-l": "languages", "--languages": "languages",
+    "-i": "ides", "--ides": "ides",
+    "-p": "templates", "--templates": "templates",
+    "-d": "defaults", "--defaults": "defaults",
+    "-g": "generate_defaults", "--generate_defaults": "generate_defaults",
+    "-j": "generate_json", "--generate_json": "generate_json",
+}
+
+# Top-level options that take the following argument as their value
+VALUE_FLAGS = frozenset(("-p", "--templates", "-d", "--defaults", "-g", "--generate_defaults"))
+
+# Accepted answers to yes/no prompts, compared after lower-casing
+YES_ANSWERS = frozenset(("y", "yes"))
+
+# Hints printed after an error message
+TEMPLATES_HINT = "for a list of templates, use 'codeforge.py --templates {language}'\n"
+FIELDS_HINT = "for a list of fields, use 'codeforge.py --defaults'\n"
+IDES_HINT = "for a list of supported IDEs, use 'codeforge.py --ides'\n"
+CASE_SENSITIVE_NOTE = "note: some operating systems have case-sensitive directories, and thus might throw an error if mis-typed\n"
+
+
+def show_help():
     """
-    Handles provided arguments, then runs create_project().
+    Displays the help message.
     """
-    parser = argparse.ArgumentParser(add_help=False)
+    stdout.write(HELP_TEXT)
 
-    # Define optional flags
-    parser.add_argument("-h", "--help", action="store_true", help="Show this help message and exit")
-    parser.add_argument("-l", "--languages", action="store_true", help="Show the supported languages and exit")
-    parser.add_argument("-i", "--ides", action="store_true", help="Show the supported IDEs and exit")
-    parser.add_argument("-p", "--templates", type=str, help="Show the templates for a chosen language and exit")
-    parser.add_argument("-d", "--defaults", type=str, help="Show the configurable default fields for a chosen language and exit")
-    parser.add_argument("-g", "--generate_defaults", type=str, help="Generate the default template files and default configs for a given language and exit")
-    parser.add_argument("-j", "--generate_json", action="store_true", help="Generate the config.json file and exit")
 
-    subparsers = parser.add_subparsers(dest="command")
+def handle_fast_args() -> bool:
+    """
+    Handles simple flag-only invocations without building the argument parser.
 
-    # Define create subcommand
-    create_parser = subparsers.add_parser("create", help="Creates a project")
-    create_parser.add_argument("name", type=str, help="The name of the project")
-    create_parser.add_argument("language", type=str, help="The programming language for the project")
-    create_parser.add_argument("-t", "--template", type=str, default=None, help="Use a custom template. Defaults to the language default")
-    create_parser.add_argument("-p", "--project", action='store_true', help="If using C#, creates a .csproj instead of a .csx")
-    create_parser.add_argument("-n", "--nullable", action="store_true", help="If using C#, enables nullable error checking")
-    create_parser.add_argument("-r", "--repository", action="store_true", help="Initializes a git repository in the project folder")
-    create_parser.add_argument("-c", "--code", action="store_true", help="Opens the project folder via VS Code once created")
-    create_parser.add_argument("-o", "--output", type=str, default = None, help="Specifies the output path for the project")
+    Returns:
+        bool: True if the arguments were handled, otherwise False.
+    """
+    flag = argv[1]
+    name = FLAG_NAMES.get(flag)
+    if name is None:
+        return False
 
-    # Define template subcommand
-    template_parser = subparsers.add_parser("template", help="Creates a template")
-    template_parser.add_argument("name", type=str, help="The name of the template")
-    template_parser.add_argument("language", type=str, help="The programming language for the template")
-    template_parser.add_argument("description", type=str, nargs="?", default="A custom template",
-                                 help="A description for the template. Default is 'A custom template'")
-    
-    # Define default subcommand
-    default_parser = subparsers.add_parser("default", help="Configures default fields")
-    default_parser.add_argument("language", type=str, help="The language to change a field of")
-    default_parser.add_argument("field", type=str, help="The field to be changed e.g output path")
-    default_parser.add_argument("value", type=str, help="The new value")
+    # Anything beyond a lone flag (and its value) is left for argparse to validate
+    takes_value = flag in VALUE_FLAGS
+    if len(argv) != (3 if takes_value else 2):
+        return False
 
-    args = parser.parse_args()
+    HANDLERS[name](SimpleNamespace(**{name: argv[2] if takes_value else True}))
+    return True
 
-    if args.help:
-        show_help()
-        return
 
-    if args.languages:
-        get_languages(True)
-        return
-    
-    if args.ides:
-        get_ides(True)
-        return
-    
-    if args.templates:
-        get_templates(args.templates, True)
-        return
-    
-    if args.defaults:
-        get_defaults(args.defaults, True)
-        return
+def handle_languages(args) -> None:
+    """
+    Shows the supported languages.
+    """
+    from modules.functions import get_languages
+    get_languages(True)
 
-    if args.generate_defaults:
-        language = get_language(args.generate_defaults)
-        generate_defaults(language.name)
-        create_defaults(language.language)
-        return
-    
-    if args.generate_json:
-        generate_json(True)
+
+def handle_ides(args) -> None:
+    """
+    Shows the supported IDEs.
+    """
+    from modules.functions import get_ides
+    get_ides(True)
+
+
+def handle_templates(args) -> None:
+    """
+    Shows the templates for a chosen language.
+    """
+    from modules.functions import get_templates
+    get_templates(args.templates, True)
+
+
+def handle_defaults(args) -> None:
+    """
+    Shows the configurable default fields for a chosen language.
+    """
+    from modules.functions import get_defaults
+    get_defaults(args.defaults, True)
+
+
+def handle_generate_defaults(args) -> None:
+    """
+    Generates the default template files and default configs for a chosen language.
+    """
+    from modules.functions import get_language, generate_defaults
+    from modules.create_template import create_defaults
+    language = get_language(args.generate_defaults)
+    generate_defaults(language.name)
+    create_defaults(language.language)
+
+
+def handle_generate_json(args) -> None:
+    """
+    Generates the config.json file.
+    """
+    from modules.functions import generate_json
+    generate_json(True)
+
+
+def handle_template(args) -> None:
+    """
+    Handles the 'template' command, creating a template.
+    """
+    from modules.functions import get_language, get_templates_for
+    language = get_language(args.language)
+
+    filename = args.name
+    # get_templates_for() already scans the folder, so reuse it rather than probing the file
+    if filename in get_templates_for(language):
+        stderr.write(f"codeforge.py: error: template '{filename}' already exists.\n{TEMPLATES_HINT.format(language=language.language)}")
         return
 
-    # Handle 'template' command
-    if args.command == "template":
-        language = get_language(args.language)
-        
-        filename = args.name.lower()
-        if path.exists(path.abspath(path.join(".", "templates", language.language, filename))):
-            print(f"codeforge.py: error: template '{filename}' already exists.")
-            print("for a list of templates, use 'codeforge.py --templates'")
-            return
+    from modules.create_template import create_template
+    create_template(filename, language.language, args.description)
+
+
+def handle_default(args) -> None:
+    """
+    Handles the 'default' command, configuring a default field.
+    """
+    from modules.functions import get_language, get_defaults, get_ides, update_defaults
+    language = get_language(args.language)
 
-        create_template(args.name, language, args.description)
+    defaults = get_defaults(language.name)
+    field = args.field
+    if field not in defaults:
+        stderr.write(f"codeforge.py: error: field '{field}' does not exist.\n{FIELDS_HINT}")
         return
-    
-    # Handle 'default' command
-    elif args.command == "default":
-        language = get_language(args.language)
-        
-        defaults = get_defaults(language.name)
-        field = args.field.lower()
-        if not field in defaults.keys():
-            print(f"codeforge.py: error: field '{field}' does not exist.")
-            print("for a list of fields, use 'codeforge.py --defaults'")
+    value = args.value
+    if field == "output_path":
+        if not path.isdir(value):
+            stderr.write(f"codeforge.py: error: directory '{value}' does not exist.\n{CASE_SENSITIVE_NOTE}")
             return
-        value = args.value
-        if field == "output":
-            if not path.exists(value):
-                print(f"codeforge.py: error: directory '{value}' does not exist.")
-                print("note: some operating systems have case-sensitive directories, and thus might throw an error if mis-typed")
-                return
-        elif field == "ide":
-            if not value in get_ides():
-                print(f"codeforge.py: error: IDE '{value}' is not supported!")
-                print("for a list of supported IDEs, use 'codeforge.py --ides'")
-                return
-        update_defaults(language.name, field, value, True)
-        return
-    
-    # Else, handle create function
-    project_name = args.name.lower()
+    elif field == "ide":
+        if value not in get_ides():
+            stderr.write(f"codeforge.py: error: IDE '{value}' is not supported!\n{IDES_HINT}")
+            return
+    update_defaults(language.name, field, value, True)
+
+
+def handle_create(args) -> None:
+    """
+    Handles the 'create' command, then runs create_project().
+    """
+    from modules.functions import get_language, get_templates_for, get_defaults, update_defaults
+    project_name = args.name
     language = get_language(args.language, args.project)
 
     defaults = get_defaults(language.name)
 
-    if args.template:
-        template = args.template.lower()
-        templates = get_templates(language.language)
-        if not template in templates:
-            print(f"codeforge.py: error: template '{template}' not found for {language.language}.")
-            print(f"for a list of templates, use 'codeforge.py --templates {language.language}'")
-            return
-    else:
-        get_templates(language.language)
-        template = defaults['template']
+    template = args.template or defaults['template']
+    if template not in get_templates_for(language):
+        stderr.write(f"codeforge.py: error: template '{template}' not found for {language.language}.\n{TEMPLATES_HINT.format(language=language.language)}")
+        return
 
     if args.nullable:
         if language.language != "c#":
-            print("codeforge.py: error: language chosen is not C#, and thus does not support enabling nullable error checking")
+            stderr.write("codeforge.py: error: language chosen is not C#, and thus does not support enabling nullable error checking\n")
             return
         elif not args.project:
-            print("codeforge.py: error: cannot enable nullable error checking for csx file")
+            stderr.write("codeforge.py: error: cannot enable nullable error checking for csx file\n")
             return
 
     if args.output:
         output_path = args.output
-        if not path.exists(output_path):
-            print(f"codeforge.py: error: cannot find directory '{output_path}'")
-            print("note: some operating systems have case-sensitive directories, and thus might throw an error if mis-typed")
+        if not path.isdir(output_path):
+            stderr.write(f"codeforge.py: error: cannot find directory '{output_path}'\n{CASE_SENSITIVE_NOTE}")
             return
     else:
-        default_path = path.abspath(defaults['output_path'])
+        output_path = path.abspath(defaults['output_path'])
 
-        if not path.exists(default_path):
-            create = input(f"The default output folder '{default_path}' does not exits. Would you like to create it?\n(Y) Y/N: ").strip().lower()
+        # A single stat answers both whether the folder exists and whether it is usable
+        if not path.isdir(output_path):
+            create = input(f"The default output folder '{output_path}' does not exits. Would you like to create it?\n(Y) Y/N: ").strip().lower()
 
             if create == 'n':
                 output_path = path.join('.', 'projects', language.language)
                 print(f"Rewriting default path to '{path.abspath(output_path)}'")
                 update_defaults(language.name, 'output_path', output_path)
             else:
-                makedirs(default_path)
+                makedirs(output_path)
                 print("Successfully created folder")
-                output_path = default_path
-        else:
-            output_path = default_path
-    
+
+    from modules.create_project import create_project
     create_project(project_name, language, template, args.nullable, args.repository, args.code, output_path)
 
 
+# Maps each top-level flag or command to its handler
+# Flags are checked in this order, and a command is only run if no flag is set
+# If neither a flag nor a command is given, the help message is shown
+HANDLER_FLAGS = ("help", "languages", "ides", "templates", "defaults", "generate_defaults", "generate_json")
+HANDLERS = {
+    None: lambda args: show_help(),
+    "help": lambda args: show_help(),
+    "generate_json": handle_generate_json,
+    "languages": handle_languages,
+    "ides": handle_ides,
+    "templates": handle_templates,
+    "defaults": handle_defaults,
+    "generate_defaults": handle_generate_defaults,
+    "template": handle_template,
+    "default": handle_default,
+    "create": handle_create,
+}
+
+
+def build_create_parser(subparsers) -> None:
+    """
+    Adds the 'create' subcommand parser.
+    """
+    create_parser = subparsers.add_parser("create", allow_abbrev=False, help="Creates a project")
+    create_parser.add_argument("name", type=str.lower, help="The name of the project")
+    create_parser.add_argument("language", type=str.lower, help="The programming language for the project")
+    create_parser.add_argument("-t", "--template", type=str.lower, default=None, help="Use a custom template. Defaults to the language default")
+    create_parser.add_argument("-p", "--project", action='store_true', help="If using C#, creates a .csproj instead of a .csx")
+    create_parser.add_argument("-n", "--nullable", action="store_true", help="If using C#, enables nullable error checking")
+    create_parser.add_argument("-r", "--repository", action="store_true", help="Initializes a git repository in the project folder")
+    create_parser.add_argument("-c", "--code", action="store_true", help="Opens the project folder via VS Code once created")
+    create_parser.add_argument("-o", "--output", type=str, default = None, help="Specifies the output path for the project")
+
+
+def build_template_parser(subparsers) -> None:
+    """
+    Adds the 'template' subcommand parser.
+    """
+    template_parser = subparsers.add_parser("template", allow_abbrev=False, help="Creates a template")
+    template_parser.add_argument("name", type=str.lower, help="The name of the template")
+    template_parser.add_argument("language", type=str.lower, help="The programming language for the template")
+    template_parser.add_argument("description", type=str, nargs="?", default="A custom template",
+                                 help="A description for the template. Default is 'A custom template'")
+
+
+def build_default_parser(subparsers) -> None:
+    """
+    Adds the 'default' subcommand parser.
+    """
+    default_parser = subparsers.add_parser("default", allow_abbrev=False, help="Configures default fields")
+    default_parser.add_argument("language", type=str.lower, help="The language to change a field of")
+    default_parser.add_argument("field", type=str.lower, help="The field to be changed e.g output path")
+    default_parser.add_argument("value", type=str, help="The new value")
+
+
+# Maps each subcommand to the function that builds its parser
+SUBPARSER_BUILDERS = {
+    "create": build_create_parser,
+    "template": build_template_parser,
+    "default": build_default_parser,
+}
+
+
+def find_command() -> str | None:
+    """
+    Returns the subcommand given in the arguments, or None if only flags were given.
+    """
+    arguments = iter(argv[1:])
+    for argument in arguments:
+        if argument in VALUE_FLAGS:
+            # Skip the flag's value so it isn't mistaken for a command
+            next(arguments, None)
+        elif not argument.startswith("-"):
+            return argument
+    return None
+
+
+def handle_args() -> None:
+    """
+    Handles provided arguments, then runs create_project().
+    """
+    # Only import argparse once we know the arguments need parsing
+    import argparse
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+
+    # Define optional flags
+    parser.add_argument("-h", "--help", action="store_true", help="Show this help message and exit")
+    parser.add_argument("-l", "--languages", action="store_true", help="Show the supported languages and exit")
+    parser.add_argument("-i", "--ides", action="store_true", help="Show the supported IDEs and exit")
+    parser.add_argument("-p", "--templates", type=str, help="Show the templates for a chosen language and exit")
+    parser.add_argument("-d", "--defaults", type=str, help="Show the configurable default fields for a chosen language and exit")
+    parser.add_argument("-g", "--generate_defaults", type=str, help="Generate the default template files and default configs for a given language and exit")
+    parser.add_argument("-j", "--generate_json", action="store_true", help="Generate the config.json file and exit")
+
+    # Only build the parser for the subcommand being used
+    # Flag-only invocations skip building any subcommands
+    command = find_command()
+    if command is None:
+        parser.set_defaults(command=None)
+    else:
+        subparsers = parser.add_subparsers(dest="command")
+        if command in SUBPARSER_BUILDERS:
+            SUBPARSER_BUILDERS[command](subparsers)
+        else:
+            # Build every subparser so argparse can list the valid choices
+            for build_parser in SUBPARSER_BUILDERS.values():
+                build_parser(subparsers)
+
+    args = parser.parse_args()
+
+    # Dispatch to the first flag that was given, otherwise to the chosen command
+    active = next((flag for flag in HANDLER_FLAGS if getattr(args, flag)), args.command)
+    HANDLERS[active](args)
+
+
+def ask_yes_no(prompt: str, default: bool = False) -> bool:
+    """
+    Asks the user a yes/no question, returning True if they answered yes.
+
+    Arguments:
+        prompt (str): The question to display.
+        default (bool, optional): The answer used if the input is left blank. Defaults to False.
+    """
+    answer = input(prompt).strip().lower()
+    if not answer:
+        return default
+    return answer in YES_ANSWERS
+
+
 def ask_inputs() -> None:
     """
     Asks user for argument inputs, then runs create_project().
     """
+    from modules.functions import get_language, get_languages, get_templates_for, get_defaults, supported_languages
     project_name = input("What will the project be called?\nName: ").lower()
 
     get_languages(True)
     language_input = input("\nWhat language will the project use?\nLanguage: ").lower()
-    if not language_input in get_languages():
+    if language_input not in supported_languages:
         print(f"Error: language '{language_input}' not supported.")
         input("Press enter to exit!")
         return
     
-    project = False
-    if language_input.lower() == "c#" and (input("\nDo you want to create a csproject instead of a .csx?\n(Y) Y/N: ").lower() == "y"):
-        project = True
+    project = language_input == "c#" and ask_yes_no("\nDo you want to create a csproject instead of a .csx?\n(Y) Y/N: ", True)
     language = get_language(language_input, project)
 
     defaults = get_defaults(language.name)
 
-    nullable = False
-    if not language.language == "c#":
-        nullable = False
-    elif (input("\nDo you want to enable nullable error checking?\n(Y) Y/N: ").lower() == "y"):
-        nullable = True
+    nullable = language.language == "c#" and ask_yes_no("\nDo you want to enable nullable error checking?\n(Y) Y/N: ", True)
 
-    templates = get_templates(language.language, True)
+    templates = get_templates_for(language, True)
     template = input("\nDo you want to use a template? Leave blank to use default ('blank')\nTemplate: ").lower()
 
     if template == "":
@@ -252,47 +399,22 @@ def ask_inputs() -> None:
         input("Press enter to exit!")
         return
 
-    create_repo = False
-    if (input("Do you want to initialize a git repository for the project?\n(N) Y/N: ") == "y"):
-        create_repo = True
+    create_repo = ask_yes_no("Do you want to initialize a git repository for the project?\n(N) Y/N: ")
+    open_project = ask_yes_no("Do you want to open the project in VS Code?\n(N) Y/N: ")
 
-    open_project = False
-    if input("Do you want to open the project in VS Code?\n(N) Y/N: ") == "y":
-        open_project = True
-    create_project(project_name, language, template, nullable, create_repo, open_project, defaults['output'])
-
-
-def initialize() -> None:
-    """
-    Initializes language and IDE objects.
-    """
-    if not path.exists('config.json'):
-        generate_json()
-    
-    with open('config.json', 'r') as file:
-        data = json.load(file)
-
-    # Initialize languages
-    languages = data["languages"]
-    for key, value in languages.items():
-        # Handle cases where JSON does not provide values for "shebang" or "gitignore"
-        shebang = value.get("shebang", None)
-        gitignore = value.get("gitignore", "")
-        Language(name=key, language=value["language"], extension=value["extension"], shebang=shebang, gitignore=gitignore)
-    
-    # Initialize IDEs
-    ides = data["ides"]
-    for key, value in ides.items():
-        # Handle cases where JSON does not provide values for "open_command"
-        open_command = value.get("open_command", None)
-        IDE(display_name=key, name=value["name"], open_command=open_command)
+    from modules.create_project import create_project
+    create_project(project_name, language, template, nullable, create_repo, open_project, defaults['output_path'])
 
 
 if __name__ == "__main__":
-    initialize()
     # Check if arguments have been given
     # if not, ask for inputs manually
-    if len(argv) >= 2:
-        handle_args()
-    else:
-        ask_inputs()
\ No newline at end of file
+    try:
+        if len(argv) >= 2:
+            if not handle_fast_args():
+                handle_args()
+        else:
+            ask_inputs()
+    except LanguageNotSupportedError as error:
+        stderr.write(f"codeforge.py: error: {error}")
+        exit(1)
\ No newline at end of file
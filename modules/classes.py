@@ -1,3 +1,6 @@
+from sys import intern
+
+
 class Language():
     """
     A class representing a language with its associated programming language, file extension, optional shebang, and optional gitignore.
@@ -9,6 +12,7 @@ class Language():
         shebang (str, optional): The shebang line (e.g., "#!/usr/bin/env python3") to be used at the beginning of a script.
         gitignore (str, optional): The contents of the .gitignore file if creating a git repo.
     """
+    __slots__ = ("name", "language", "extension", "shebang", "gitignore")
     languages = {}
     def __init__(self, *, name:str, language:str, extension:str, shebang:str = None, gitignore:str = "") -> None:
         """
@@ -21,9 +25,10 @@ class Language():
             shebang (str, optional): The shebang line for the language, if applicable. Defaults to None.
             gitignore (str, optional): The contents of the .gitignore file if creating a git repo. Defaults to an empty string
         """
-        self.name = name.lower()
-        self.language = language.lower()
-        self.extension = extension.lower()
+        # Interned so comparisons against literals like "c#" can match on identity
+        self.name = intern(name.lower())
+        self.language = intern(language.lower())
+        self.extension = intern(extension.lower())
         self.shebang = shebang
         self.gitignore = gitignore
         Language.languages[self.name] = self
@@ -43,6 +48,7 @@ class IDE():
         name (str): The name of the programming language (e.g., "python").
         open_command (str, optional): The command to open the directory with the IDE (e.g., "code 'path/to/directory'" for VS Code).
     """
+    __slots__ = ("display_name", "name", "open_command")
     ides = {}
     def __init__(self, *, display_name: str, name:str, open_command:str = None) -> None:
         """
@@ -59,4 +65,12 @@ class IDE():
         IDE.ides[display_name] = self
         
     def __str__(self) -> str:
-        return(f"{self.name.capitalize()}: {self.open_command}")
\ No newline at end of file
+        return(f"{self.name.capitalize()}: {self.open_command}")
+
+
+class LanguageNotSupportedError(ValueError):
+    """
+    Raised when a language, or the config for a language, is not supported.
+
+    The message is the full error shown to the user, including any hints.
+    """
@@ -1,6 +1,9 @@
-from os import path, system as os_system, makedirs, remove
-from platform import system as platform_system
-from shutil import rmtree
+from os import path, makedirs, remove, scandir, stat, chmod, sep
+from functools import lru_cache
+from shlex import split as shlex_split
+from subprocess import run, Popen, DEVNULL
+from shutil import rmtree, which
+from sys import stderr, platform
 
 # Need to use modules.classes as this script is intended to be called
 # from codeforge.py, which is in a parent directory and thus imports must
@@ -8,6 +11,99 @@ from shutil import rmtree
 from modules.classes import Language, IDE
 from modules.functions import get_defaults
 
+# The project file 'dotnet new console' creates, with the target framework and nullable setting left to fill in
+CSPROJ_TEMPLATE = """<Project Sdk="Microsoft.NET.Sdk">
+
+  <PropertyGroup>
+    <OutputType>Exe</OutputType>
+    <TargetFramework>{framework}</TargetFramework>
+    <ImplicitUsings>enable</ImplicitUsings>
+    <Nullable>{nullable}</Nullable>
+  </PropertyGroup>
+
+</Project>
+"""
+
+
+@lru_cache(maxsize=None)
+def find_executable(name: str) -> str | None:
+    """
+    Returns the full path of an executable found on PATH, or None if it is not installed.
+
+    Results are cached, so PATH is only searched once for each executable.
+
+    Args:
+        name (str): The name of the executable (e.g., "git")
+    """
+    return which(name)
+
+
+@lru_cache(maxsize=None)
+def get_target_framework() -> str | None:
+    """
+    Returns the target framework of the newest installed .NET SDK (e.g., "net8.0"), or None if it cannot be found.
+
+    The SDKs are found next to the dotnet executable, so the .NET host never has to be started.
+    """
+    dotnet = find_executable("dotnet")
+    if dotnet is None:
+        return None
+
+    sdk_folder = path.join(path.dirname(path.realpath(dotnet)), "sdk")
+    majors = []
+    try:
+        with scandir(sdk_folder) as entries:
+            for entry in entries:
+                try:
+                    majors.append(int(entry.name.split(".", 1)[0]))
+                except ValueError:
+                    continue
+    except OSError:
+        return None
+
+    # SDKs before .NET 6 create a different project file, which 'dotnet new' handles better
+    major = max(majors, default=0)
+    return f"net{major}.0" if major >= 6 else None
+
+
+def find_global_json(directory: str) -> str | None:
+    """
+    Returns the path of the global.json that applies to a directory, or None if there is none.
+
+    A global.json can pin an older SDK than the newest installed one, so it is searched for from the directory upwards.
+
+    Args:
+        directory (str): The directory to start searching from.
+    """
+    directory = path.abspath(directory)
+    while True:
+        global_json = path.join(directory, "global.json")
+        if path.isfile(global_json):
+            return global_json
+        parent = path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+@lru_cache(maxsize=128)
+def load_template(template_path: str, mtime: int) -> bytes:
+    """
+    Returns the contents of a template, without its two description lines.
+
+    Results are cached, with the template's mtime as part of the key so edited templates are read again.
+
+    Args:
+        template_path (str): The path of the template file
+        mtime (int): The modification time of the template in nanoseconds
+    """
+    with open(template_path, "rb") as file:
+        content = file.read()
+    # Skip the first two lines as they only include template description
+    end = content.find(b"\n", content.find(b"\n") + 1)
+    return content[end + 1:] if end != -1 else b""
+
+
 def create_project(project_name:str,
                    language: Language,
                    template: str,
@@ -32,53 +128,70 @@ def create_project(project_name:str,
     project_path = path.abspath(path.join(output, project_name))
 
     if path.exists(project_path):
-        if input("Folder already exists. Do you want to overwrite it's contents?\n(Y) Y/N: ").lower() == 'n':
-            print("Exiting program")
-            return
-        rmtree(project_path)
+        with scandir(project_path) as entries:
+            empty = next(entries, None) is None
+        # An empty folder has nothing to overwrite, so it can be used as it is
+        if not empty:
+            if input("Folder already exists. Do you want to overwrite it's contents?\n(Y) Y/N: ").lower() == 'n':
+                print("Exiting program")
+                return
+            rmtree(project_path)
 
-    makedirs(project_path)
+    makedirs(project_path, exist_ok=True)
     if language.extension == "cs":
-        os_system(f'dotnet new console -n {project_name} -o "{project_path}"')
-        remove(path.join(project_path, f"Program.cs"))
-
-    template_path = f"{path.join("templates", language.language, template)}.txt"
-    with open(template_path, "r") as file:
-        template_lines = file.readlines()
-    # Remove first two lines as they only include template description
-    template_lines = template_lines[2:len(template_lines)]
-        
+        # A global.json may pin an SDK other than the newest, so leave the framework choice to 'dotnet new'
+        framework = get_target_framework() if find_global_json(project_path) is None else None
+        if framework is not None:
+            # Writing the project file directly avoids starting the .NET host for 'dotnet new'
+            with open(path.join(project_path, f"{project_name}.csproj"), 'w') as file:
+                file.write(CSPROJ_TEMPLATE.format(framework=framework, nullable="enable" if nullable else "disable"))
+        else:
+            dotnet = find_executable("dotnet")
+            if dotnet is None:
+                stderr.write("codeforge.py: error: cannot find 'dotnet', which is needed to create C# projects.\n")
+                return
+            run([dotnet, "new", "console", "-n", project_name, "-o", project_path])
+            remove(path.join(project_path, "Program.cs"))
+
+            if not nullable:
+                # Rewrite the csproj in place, only writing if the setting was there to change
+                with open(path.join(project_path, f"{project_name}.csproj"), 'r+b') as file:
+                    content = file.read()
+                    new_content = content.replace(b"<Nullable>enable</Nullable>", b"<Nullable>disable</Nullable>")
+                    if new_content != content:
+                        file.seek(0)
+                        file.write(new_content)
+                        file.truncate()
+
+    template_path = f"templates{sep}{language.language}{sep}{template}.txt"
+    content = load_template(template_path, stat(template_path).st_mtime_ns)
+
     if language.shebang:
-        template_lines.insert(0, f"{language.shebang}\n")
-    with open(path.join(project_path, f"{project_name}.{language.extension}"), "w+") as file:
-        file.writelines(template_lines)
+        content = f"{language.shebang}\n".encode() + content
 
-    if not nullable and language.extension == "cs":
-        with open(path.join(project_path, f"{project_name}.csproj"), 'r') as file:
-            content = file.read()
-        content = content.replace("<Nullable>enable</Nullable>", "<Nullable>disable</Nullable>")
-        with open(path.join(project_path, f"{project_name}.csproj"), 'w') as file:
-            content = file.write(content)
+    file_path = path.join(project_path, f"{project_name}.{language.extension}")
+    with open(file_path, "wb") as file:
+        # Blank templates have nothing to write
+        if content:
+            file.write(content)
+
+    # Provide execute permissions for the file
+    # Windows has no execute bit, so this is harmless there
+    if language.language != "c#": # C# output is built or run through dotnet, never run directly as a script
+        chmod(file_path, stat(file_path).st_mode | 0o111)
 
     print(f"Successfully created project at '{project_path}'")
 
-    operating_system = platform_system()
-    # Provide execute permissions for the file if on linux
-    if operating_system == "Linux":
-        if language.language != "c#": # C# uses 'dotnet new' which already provides permissions
-            os_system(f'chmod +x "{path.join(project_path, f"{project_name}.{language.extension}")}"')
-    
     if create_repo: 
-        if operating_system == "Windows":
-            next_command = "&&"
-        elif operating_system == "Linux":
-            next_command = ";"
+        # git takes the folder to initialize directly, so no shell or change of directory is needed
+        git = find_executable("git")
+        if git is None:
+            stderr.write("codeforge.py: error: cannot find 'git', skipping repository creation.\n")
         else:
-            print(f"Error: Unsupported operating system {operating_system}")
-        os_system(f'cd "{project_path}" {next_command} git init')
+            run([git, "init", "--quiet", project_path])
 
-        with open(path.join(project_path, ".gitignore"), 'w+') as file:
-            file.write(language.gitignore)
+        with open(path.join(project_path, ".gitignore"), 'wb') as file:
+            file.write(language.gitignore.encode())
     
     if open_project:
         ide_dict = get_defaults(language.name)["ide"]
@@ -87,17 +200,28 @@ def create_project(project_name:str,
         for item in IDE.ides.values():
             if item.name == ide_dict:
                 ide = item
-        if IDE is None:
-            print(f"Unknown IDE: '{ide_dict}'")
+        if ide is None:
+            stderr.write(f"codeforge.py: error: IDE '{ide_dict}' is not supported!\n")
             return
         ide_command = ide.open_command
 
         if ide_command is None:
-            print(f"codeforge.py: error: IDE '{ide.name}' does not have an open directory command.")
+            stderr.write(f"codeforge.py: error: IDE '{ide.name}' does not have an open directory command.\n")
             return
 
-        # Remove ide.open_command path identifier with actual path
-        command = ide_command.replace("%PATH%", f'"{path.abspath(project_path)}"')
-        os_system(command)
+        # Split the command before replacing the path identifier, so paths with spaces stay a single argument
+        command = [arg.replace("%PATH%", project_path) for arg in shlex_split(ide_command)]
+        executable = find_executable(command[0])
+        if executable is None:
+            stderr.write(f"codeforge.py: error: cannot find '{command[0]}' to open the project with.\n")
+            return
+
+        # Start the IDE detached rather than waiting for it, so codeforge can exit straight away
+        if platform == "win32":
+            from subprocess import DETACHED_PROCESS, CREATE_NEW_PROCESS_GROUP
+            detach = {"creationflags": DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP}
+        else:
+            detach = {"start_new_session": True}
+        Popen([executable, *command[1:]], stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL, **detach)
     
     return
\ No newline at end of file
@@ -1,15 +1,49 @@
-from os import path, makedirs
+from os import path, makedirs, scandir, sep
+from functools import lru_cache
 
+# Languages whose templates folder is known to exist
+_checked_folders: set[str] = set()
 
+# The default templates of each language in the form {language: ((name, description, body), ...)}
+DEFAULT_TEMPLATES: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "python": (
+        ("hello world", "A simple 'hello world' file.", 'print("Hello, World!")\n'),
+        ("if name main", "A file with the 'if name main' boilerplate code.", """def main():
+    print("Hello, World!")
+
+
+if __name__ == '__main__':
+    main()
+"""),
+    ),
+    "c#": (
+        ("hello world", "A simple 'hello world' file.", """namespace project;
+
+class Program
+{
+    static void Main(string[] args)
+    {
+        Console.WriteLine("Hello, World!");                 
+    }
+}
+"""),
+    ),
+}
+BLANK_TEMPLATE = ("blank", "A blank file", "")
+
+
+@lru_cache(maxsize=256)
 def get_file_path(filename: str, language:str, ) -> str:
     """
     Returns the path of a txt file, depending on the language it is in.
 
+    Paths are cached, as the working directory does not change during a run.
+
     Args:
         filename (str): The name of the file
         language (str): The language of the file
     """
-    return path.abspath(path.join(".", "templates", language, filename) + '.txt')
+    return path.abspath(f"templates{sep}{language}{sep}{filename}.txt")
 
 
 def create_template(filename: str, language:str, desc: str, show: bool = True) -> None:
@@ -24,8 +58,10 @@ def create_template(filename: str, language:str, desc: str, show: bool = True) -
         desc (str, optional): The description of the template.
         show (bool, optional): Will show an output message when successful. Default is True
     """
-    if not path.exists(path.join("templates", language)):
-        create_defaults(language, False)
+    if language not in _checked_folders:
+        if not path.exists(f"templates{sep}{language}"):
+            create_defaults(language, False)
+        _checked_folders.add(language)
 
     file_path = get_file_path(filename, language)
     with open(file_path, "w+") as template:
@@ -46,66 +82,27 @@ def create_defaults(language:str, show: bool = True) -> None:
         language (str): The language that the template is for.
         show (bool, optional): Will show an output message when successful. Default is True
     """
-    makedirs(path.join("templates", language), exist_ok=True)
+    folder_path = f"templates{sep}{language}"
+    makedirs(folder_path, exist_ok=True)
+    # List the folder once instead of checking for each template separately
+    with scandir(folder_path) as entries:
+        existing = {entry.name for entry in entries}
+    _checked_folders.add(language)
 
     created = 0
-    # Create python templates
-    if language == "python":
-        # Create 'hello world'
-        file_path = get_file_path("hello world", "python")
-        if not path.exists(file_path):
-            created += 1
-            with open (file_path, 'w+') as template:
-                template.write(f"# Description:\n# A simple 'hello world' file.\n")
-                template.write("print(\"Hello, World!\")\n")
-            if show: print(f"Successfully created 'hello, world!' at '{file_path}'")
-
-        # Create 'if name main'
-        file_path = get_file_path("if name main", "python")
-        if not path.exists(file_path):
-            created += 1
-            with open (file_path, 'w+') as template:
-                template.write(f"# Description:\n# A file with the 'if name main' boilerplate code.\n")
-                template.write("""def main():
-    print("Hello, World!")
-
-
-if __name__ == '__main__':
-    main()
-""")
-            if show: print(f"Successfully created 'if name main' at '{file_path}'")
-    
-    # Create C# templates
-    elif language == "c#":    
-        # Create 'hello world'
-        file_path = get_file_path("hello world", "c#")
-        if not path.exists(file_path):
-            created += 1
-            with open(file_path, "w+") as template:
-                template.write(f"# Description:\n# A simple 'hello world' file.\n")
-                template.write("""namespace project;
+    # Every language gets a 'blank' template, after its own defaults
+    for name, desc, body in DEFAULT_TEMPLATES.get(language, ()) + (BLANK_TEMPLATE,):
+        if f"{name}.txt" in existing:
+            continue
 
-class Program
-{
-    static void Main(string[] args)
-    {
-        Console.WriteLine("Hello, World!");                 
-    }
-}
-""")
-            if show: print(f"Successfully created 'hello world' at '{file_path}'")
-    
-    # Create global 'blank' template
-    file_path = get_file_path("blank", language)
-    if not path.exists(file_path):
         created += 1
+        file_path = get_file_path(name, language)
         with open(file_path, 'w+') as template:
-            template.write(f"# Description:\n# A blank file\n")
-        if show: print(f"Successfully created 'blank' at '{file_path}'")
-
+            template.write(f"# Description:\n# {desc}\n{body}")
+        if show: print(f"Successfully created '{name}' at '{file_path}'")
 
     if not show: return
     if created > 0:
         print(f"Successfully created all missing default templates for '{language}'")
         return
-    print(f"All default templates already exist for '{language}'")
\ No newline at end of file
+    print(f"All default templates already exist for '{language}'")
@@ -1,56 +1,191 @@
 
-from os import path, makedirs
-from glob import glob
-import json
+from os import path, makedirs, replace, scandir, stat, sep
+from functools import lru_cache
+
+from modules.classes import Language, IDE, LanguageNotSupportedError
+
+# The parsed contents of config.json with the mtime it was read at, see load_config()
+_config_cache: tuple[int, dict] | None = None
+# Set once config.json is known to exist, see config_exists()
+_config_exists = False
+
+# Every loaded language in registration order, set by initialize(), see get_languages()
+_language_names: tuple[str, ...] = ()
+
+# Hint printed after an unknown language error
+LANGUAGES_HINT = "for a list of supported languages, use 'codeforge.py --languages'\n"
+
+# Set once initialize() has loaded the languages and IDEs from config.json
+initialized = False
+supported_languages: set[str] = set()
+# Maps each lower-cased language to its default Language object, e.g. {"c#": <cs_script>}
+languages_by_name: dict[str, Language] = {}
+
+# The languages and IDEs written to a fresh config.json by generate_json()
+DEFAULT_LANGUAGES = {
+    "python": {"language": "python", "extension": "py", "shebang": "#!/usr/bin/env python3", "gitignore": "# Ignore __pycache__\n__pycache__/"},
+    "cs_script": {"language": "c#", "extension": "csx", "shebang": "/usr/bin/env/ dotnet-script"},
+    "cs_project": {"language": "c#", "extension": "cs"},
+}
+DEFAULT_IDES = {
+    "VS Code": {"name": "vscode", "open_command": "code %PATH%"},
+}
+# Languages that ship a 'hello world' template, which is used as their default template
+HELLO_WORLD_LANGUAGES = frozenset(("python", "c#"))
+
+# The templates folder never moves during a run, so only resolve it once
+_TEMPLATES_ROOT = path.abspath(path.join(".", "templates"))
+_TEMPLATE_FOLDERS: dict[str, str] = {}
+
+# Caches the templates found for each language in the form {language: (folder_mtime, templates)}
+# The folder's mtime changes whenever a template is added or removed, invalidating the entry
+_TEMPLATE_CACHE: dict[str, tuple[int, dict]] = {}
+
+
+def config_exists() -> bool:
+    """
+    Returns whether config.json exists.
+
+    Once config.json has been found or written it is not checked again, as nothing here deletes it.
+    """
+    global _config_exists
+    if not _config_exists:
+        _config_exists = path.exists('config.json')
+    return _config_exists
+
+
+def load_config() -> dict:
+    """
+    Returns the parsed contents of config.json.
+
+    The file is only re-read once it has been modified, otherwise the same dictionary is returned.
+    """
+    global _config_cache
+    mtime = stat('config.json').st_mtime_ns
+    if _config_cache is None or _config_cache[0] != mtime:
+        # orjson is optional, but parses config.json considerably faster when installed
+        try:
+            from orjson import loads
+        except ImportError:
+            from json import loads
+
+        with open('config.json', 'rb') as file:
+            _config_cache = (mtime, loads(file.read()))
+    return _config_cache[1]
+
+
+def save_config(data: dict) -> None:
+    """
+    Writes a dictionary to config.json, and caches it as the current config.
+
+    Arguments:
+        data (dict): The full contents of the config.
+    """
+    # orjson only supports two space indents, so keep json to leave the layout of config.json unchanged
+    from json import dumps
+    global _config_cache, _config_exists
+    # Write to a temporary file first so a reader never sees a partially written config
+    # Serializing in one go turns json.dump's many small writes into a single write
+    with open('config.json.tmp', 'w') as file:
+        file.write(dumps(data, indent=4))
+    replace('config.json.tmp', 'config.json')
+    _config_cache = (stat('config.json').st_mtime_ns, data)
+    _config_exists = True
+
+
+def parse_config() -> tuple[list, list]:
+    """
+    Parses config.json into the keyword arguments for each Language and IDE object.
+
+    Returns:
+        tuple[list, list]: The Language keyword arguments, and the IDE keyword arguments.
+    """
+    data = load_config()
+
+    # Parse languages
+    languages = []
+    for key, value in data["languages"].items():
+        # Handle cases where JSON does not provide values for "shebang" or "gitignore"
+        shebang = value.get("shebang", None)
+        gitignore = value.get("gitignore", "")
+        languages.append({"name": key, "language": value["language"], "extension": value["extension"], "shebang": shebang, "gitignore": gitignore})
+
+    # Parse IDEs
+    ides = []
+    for key, value in data["ides"].items():
+        # Handle cases where JSON does not provide values for "open_command"
+        open_command = value.get("open_command", None)
+        ides.append({"display_name": key, "name": value["name"], "open_command": open_command})
+    return languages, ides
+
+
+def initialize() -> None:
+    """
+    Initializes language and IDE objects.
 
-from modules.classes import Language, IDE
-from modules.create_template import create_defaults
+    Only loads config.json on the first call, later calls return immediately.
+    """
+    global initialized, _language_names
+    if initialized:
+        return
 
+    if not config_exists():
+        generate_json()
 
+    languages, ides = parse_config()
+    for language in languages:
+        Language(**language)
+    for ide in ides:
+        IDE(**ide)
+
+    # Build the lookup tables once so validating user input is a single hash probe
+    # Updated in place so names imported from this module see the loaded values
+    supported_languages.update(language.language for language in Language.languages.values())
+    for language in Language.languages.values():
+        # Several objects can share a language (e.g. C#), the first one registered is its default
+        languages_by_name.setdefault(language.language, language)
+    _language_names = tuple(language.language for language in Language.languages.values())
+    initialized = True
+
+
+@lru_cache(maxsize=32)
 def get_language(language_name:str, project:bool = False) -> Language | str:
     """
     Checks if a language is supported or not, and then returns the Language object for said language.
 
-    Will throw an error if language is not supported.
+    Raises LanguageNotSupportedError if language is not supported.
+
     Arguments:
         language_name (str): The name of the language to check.
         project (bool, optional): Use csproj for C#. Defaults to False.
     """
-    for value in Language.languages.values():
-        if not value.language.lower() == language_name.lower():
-            continue
-        value_name = value.language.lower()
-
-        if project and value_name != "c#":
-            print("codeforge.py: error: language chosen is not C#, and thus does not support project toggle")
-            exit()
-        
-        if value_name == "c#" and project:
-            return Language.languages["cs_project"]
-        
-        return value
-    
-    # If still in function, then language is not in LANGUAGES
-    print(f"codeforge.py: error: language '{language_name}' not supported.")
-    print("for a list of supported languages, use 'codeforge.py --languages'")
-    exit()
+    initialize()
+    value = languages_by_name.get(language_name.lower())
+    if value is None:
+        raise LanguageNotSupportedError(f"language '{language_name}' not supported.\n{LANGUAGES_HINT}")
+
+    if project:
+        if value.language != "c#":
+            raise LanguageNotSupportedError("language chosen is not C#, and thus does not support project toggle\n")
+        return Language.languages["cs_project"]
+    return value
 
 
-def get_languages(show:bool = False) -> list:
+def get_languages(show:bool = False) -> tuple[str, ...]:
     """
-    Returns a list of supported languages.
+    Returns a tuple of supported languages.
+
+    The same tuple is returned on every call, as the languages do not change once loaded.
 
     Arguments:
         show (bool, optional): Display output. Defaults to False.
     """
-    if show: print("Supported languages:")
-    languages = []
-    for language in Language.languages.values():
-        name = language.language
-
-        languages.append(name)
-        if show: print(f"{name.capitalize()} ({language.name})")
-    return languages
+    initialize()
+    if show:
+        print("Supported languages:")
+        for language in Language.languages.values():
+            print(f"{language.language.capitalize()} ({language.name})")
+    return _language_names
 
 
 def get_ides(show:bool = False) -> list:
@@ -60,19 +195,36 @@ def get_ides(show:bool = False) -> list:
     Arguments:
         show (bool, optional): Display output. Defaults to False.
     """
+    initialize()
     if show: print("Supported IDEs:")
     ides = []
+    seen = set()
     for ide in IDE.ides.values():
         name = ide.name
-        if name in ides:
+        if name in seen:
             continue
 
+        seen.add(name)
         ides.append(name)
         if show: 
             print(ide.display_name)
     return ides
 
 
+def get_template_folder(language: str) -> str:
+    """
+    Returns the absolute path of the templates folder for a given language.
+
+    Arguments:
+        language (str): The programming language of the templates.
+    """
+    folder_path = _TEMPLATE_FOLDERS.get(language)
+    if folder_path is None:
+        folder_path = _TEMPLATES_ROOT + sep + language
+        _TEMPLATE_FOLDERS[language] = folder_path
+    return folder_path
+
+
 def get_templates(language_input: str, show: bool = False) -> dict:
     """
     Returns a dictionary of all found template names for a given language in the form {name: path}.
@@ -81,55 +233,82 @@ def get_templates(language_input: str, show: bool = False) -> dict:
         language_input (str): The language to find templates for.
         show (bool, optional): Display output. Defaults to False.
     """
-    language = get_language(language_input).language
-    
-    folder_path = path.abspath(path.join(".", "templates", language))
-    if not path.exists(folder_path):
-        makedirs(folder_path)
+    return get_templates_for(get_language(language_input), show)
+
+
+def get_templates_for(language_object: Language, show: bool = False) -> dict:
+    """
+    Same as get_templates(), for callers that already hold the Language object.
+
+    Arguments:
+        language_object (Language): The language to find templates for.
+        show (bool, optional): Display output. Defaults to False.
+    """
+    language = language_object.language
+
+    folder_path = get_template_folder(language)
+    # The folder's mtime is needed anyway, so use the same stat to check it exists
+    try:
+        mtime = stat(folder_path).st_mtime_ns
+    except FileNotFoundError:
+        from modules.create_template import create_defaults
+        makedirs(folder_path, exist_ok=True)
         create_defaults(language, False)
+        mtime = stat(folder_path).st_mtime_ns
+    cached = _TEMPLATE_CACHE.get(language)
+    if cached is not None and cached[0] == mtime:
+        templates = cached[1]
+    else:
+        with scandir(folder_path) as entries:
+            templates = {
+                entry.name[:-4].lower(): entry.path
+                for entry in entries
+                if entry.name.endswith(".txt") and entry.is_file(follow_symlinks=False)
+            }
+        _TEMPLATE_CACHE[language] = (mtime, templates)
 
     if show:
         print(f"{language} templates:")
-    templates = {}
-    for template in glob(path.join(folder_path, "*.txt")):
-        filename = template[len(folder_path) + 1 : -4].lower()
-        templates[filename] = template
-        if show:
-            with open(template, "r") as file:
-                desc = file.readlines()[1][2:]
-                file.close()
-            print(f"{filename}:    {desc}")
+        for filename, template in templates.items():
+            print(f"{filename}:    {describe_template(template)}")
 
     if show and len(templates) == 0:
         print(f"No templates found for {language}")
     return templates
 
 
+def describe_template(template_path: str) -> str:
+    """
+    Returns the description of a template, which is stored on its second line.
+
+    Arguments:
+        template_path (str): The path of the template file.
+    """
+    # Only the second line holds the description, so read a single small block unbuffered
+    with open(template_path, "rb", buffering=0) as file:
+        lines = file.read(512).split(b"\n", 2)
+    return lines[1][2:].decode("utf-8", "replace").rstrip() if len(lines) > 1 else ""
+
+
 def get_defaults(language_input:str, show:bool = False) -> dict:
     """
     Returns a dictionary of all default fields for a given langauge in the form {field: value}.
 
+    Raises LanguageNotSupportedError if there is no config for the language.
+
     Arguments:
         language (str): The language to get the default fields for.
         show (bool, optional): Display output. Defaults to False.
     """
-    if not path.exists('config.json'):
-        print("codeforge.py: error: cannot find 'config.json'.")
-        print("please run 'codeforge.py -generate_json' to re-generate the config file.")
-        return
-    
+    # Generates config.json first if it is missing
+    initialize()
+
     language = language_input.lower()
-    if language not in Language.languages.keys():
-        print(f"codeforge.py: error: Config for language '{language}' not found.")
-        print("for a list of configurable languages, use 'codeforge.py --languages'.")
-        print("note: when modifying configs, ensure that you use the name INSIDE of the brackets as the <language>.")
-        exit()
+    if language not in Language.languages:
+        raise LanguageNotSupportedError(f"Config for language '{language}' not found.\n{LANGUAGES_HINT}note: when modifying configs, ensure that you use the name INSIDE of the brackets as the <language>.\n")
     
-    with open('config.json', 'r') as file:
-        data = json.load(file)
-        defaults_data = data["defaults"]
-        language_defaults = defaults_data[language]
-        
+    language_defaults = load_config()["defaults"][language]
+
     if show:
         print(f"Default {language} fields:")
         for key, value in language_defaults.items():
@@ -147,14 +326,12 @@ def update_defaults(language:str, field:str, value:str, show:str = False) -> Non
         value (str): The new value of the field.
         show (bool, optional): Display output. Defaults to False.
     """
-    with open("config.json", 'r') as file:
-        data = json.load(file)
-    default_data = data["defaults"]
-    language_data = default_data[language]
-    language_data[field] = value
-
-    with open('config.json', 'w+') as file:
-        json.dump(data, file, indent=4)
+    data = load_config()
+    language_data = data["defaults"][language]
+    # Avoid rewriting config.json if the field already has this value
+    if language_data.get(field) != value:
+        language_data[field] = value
+        save_config(data)
 
     if show:
         print(f"Successfully updated field '{field}'")
@@ -169,73 +346,52 @@ def generate_defaults(language_input:str, show:bool = False) -> dict:
         language (str): The language to generate default configs for.
         show (bool, optional): Display output. Defaults to False.
     """
-    with open('config.json', 'r') as file:
-        data = json.load(file)
+    data = load_config()
     default_data = data["defaults"]
 
     if default_data.get(language_input, False):
         print(f"All default configs already exist for '{language_input}'")
         return
     
-    for language, value in Language.languages.items():
-        if not language == language_input:
-            continue
-
-        defaults = {'output_path': path.join('.', 'projects', language), 'ide': "vscode"}
+    initialize()
+    language = Language.languages.get(language_input)
+    if language is None:
+        raise LanguageNotSupportedError(f"Config for language '{language_input}' not found.\n{LANGUAGES_HINT}")
 
-        default_template = "blank"
-        if value.language in ["python", "c#"]:
-            default_template = "hello world"
-        defaults['template'] = default_template
-
-        default_data[language_input] = defaults
-    
-    with open('config.json', 'w+') as file:
-        json.dump(data, file, indent=4)
+    default_data[language_input] = default_fields(language_input, language.language)
+    save_config(data)
 
     if show:
         print(f"Successfully generated default configs for {language_input}")
     return
 
 
-def generate_json(show:bool = False) -> None:
+def default_fields(name: str, language: str) -> dict:
     """
-    Creates the config.json file if not present, otherwise it will overwrite.
+    Returns the default fields of a language config in the form {field: value}.
 
     Arguments:
-        show (bool, optional): Display output. Defaults to False.
+        name (str): The name of the language config (e.g., "cs_script").
+        language (str): The programming language the config uses (e.g., "c#").
     """
-    json_data = {}
+    template = "hello world" if language in HELLO_WORLD_LANGUAGES else "blank"
+    return {'output_path': path.join('.', 'projects', name), 'ide': "vscode", 'template': template}
 
-    # Create the language database
-    languages = {}
-    languages["python"] = {"language": "python", "extension": "py", "shebang": "#!/usr/bin/env python3", "gitignore": "# Ignore __pycache__\n__pycache__/"}
-    languages["cs_script"] = {"language": "c#", "extension": "csx", "shebang": "/usr/bin/env/ dotnet-script"}
-    languages["cs_project"] = {"language": "c#", "extension": "cs"}
 
-    # Create the IDE database
-    ides = {}
-    ides["VS Code"] = {"name": "vscode", "open_command": "code %PATH%"}
-
-    # Generate the defaults database
-    defaults = {}
-    for language in languages.keys():
-        data = {'output_path': path.join('.', 'projects', language), 'ide': "vscode"}
-
-        default_template = "blank"
-        if language in ["python", "cs_script", "cs_project"]:
-            default_template = "hello world"
-        data['template'] = default_template
-
-        defaults[language] = data
-
-    # Compile into single dictionary
-    json_data["languages"] = languages
-    json_data["ides"] = ides
-    json_data["defaults"] = defaults
+def generate_json(show:bool = False) -> None:
+    """
+    Creates the config.json file if not present, otherwise it will overwrite.
 
-    with open('config.json', 'w+') as file:
-        json.dump(json_data, file, indent=4)
+    Arguments:
+        show (bool, optional): Display output. Defaults to False.
+    """
+    # Copy the tables, as the saved dictionary becomes the cached config
+    json_data = {
+        "languages": {name: dict(value) for name, value in DEFAULT_LANGUAGES.items()},
+        "ides": {name: dict(value) for name, value in DEFAULT_IDES.items()},
+        "defaults": {name: default_fields(name, value["language"]) for name, value in DEFAULT_LANGUAGES.items()},
+    }
+    save_config(json_data)
 
     if show:
         print("Successfully created config file.")
\ No newline at end of file